@@ -1,6 +1,7 @@
 import argparse
 import importlib
 import os
+import time
 
 import ujson
 from loguru import logger
@@ -12,6 +13,8 @@ from buckets_hunter.modules.gcp import gcp_scanner
 from buckets_hunter.utils import hunter_utils
 from buckets_hunter.utils.dns import DNSUtils
 from buckets_hunter.utils.hunter_utils import generate_bucket_permutations
+from buckets_hunter.utils.prioritize import prioritize_bucket_permutations
+from buckets_hunter.utils.sampler import BucketsSampler
 
 SUPPORTED_PLATFORMS = ["aws", "azure", "gcp"]
 
@@ -62,6 +65,63 @@ def parse_args():
         dest="name_server",
         default="1.1.1.1",
     )
+    parser.add_argument(
+        "--prioritize",
+        help="Scan the most likely bucket names first.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--history",
+        help="Previous JSON scan results to prioritize bucket names by.",
+        dest="history_files",
+        nargs="+",
+        default=[],
+    )
+    parser.add_argument(
+        "--budget",
+        help="Scan only the top N bucket names.",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "--time-limit",
+        help="Stop scanning after the given number of seconds.",
+        dest="time_limit",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "--sample",
+        help="Sample the first bytes of files in readable buckets.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--sample-size",
+        help="KB to sample from each file. Default: 16.",
+        dest="sample_size",
+        type=int,
+        default=16,
+    )
+    parser.add_argument(
+        "--sample-budget",
+        help="Total MB to sample across all buckets. Default: 100.",
+        dest="sample_budget",
+        type=int,
+        default=100,
+    )
+    parser.add_argument(
+        "--sample-keys",
+        help="Max files to sample in each bucket. Default: 20.",
+        dest="sample_keys",
+        type=int,
+        default=20,
+    )
+    parser.add_argument(
+        "--sample-dir",
+        help="Save the sampled files to a local folder.",
+        dest="sample_dir",
+        default=None,
+    )
 
     return parser.parse_args()
 
@@ -76,6 +136,17 @@ def validate_args(args):
             f"BucketsHunter doesn't support {args.platform} as a platform. {SUPPORTED_PLATFORMS=}"
         )
         exit()
+    if args.budget is not None and args.budget <= 0:
+        logger.error("Budget must be a positive number of bucket names.")
+        exit()
+    if args.time_limit is not None and args.time_limit <= 0:
+        logger.error("Time limit must be a positive number of seconds.")
+        exit()
+    if min(args.sample_size, args.sample_budget, args.sample_keys) <= 0:
+        logger.error("Sample size, budget and keys must be positive numbers.")
+        exit()
+    if args.history_files:
+        args.prioritize = True
     return args
 
 
@@ -86,15 +157,34 @@ def main():
     this_dir, _ = os.path.split(__file__)
     wordlist_path= os.path.join(this_dir, "data", args.wordlist)
     with open(wordlist_path, "r", encoding="UTF-8") as wordlist_file:
-        mutations_wordlist = iter(wordlist_file.read().splitlines())
+        mutations_wordlist = wordlist_file.read().splitlines()
+
+    if args.prioritize:
+        buckets_permutations = prioritize_bucket_permutations(
+            args.keyword, mutations_wordlist, args.history_files, args.budget
+        )
+    else:
+        buckets_permutations = list(
+            generate_bucket_permutations(args.keyword, mutations_wordlist)
+        )[: args.budget]
 
     scan_config = Config(
         dns_utils=DNSUtils(args.name_server),
         output_file=args.output_file,
-        buckets_permutations=generate_bucket_permutations(
-            args.keyword, mutations_wordlist
-        ),
+        buckets_permutations=buckets_permutations,
+        # Azure containers are only bruteforced for sampling their files
+        directory_wordlist=[args.keyword, *mutations_wordlist] if args.sample else None,
         threads=args.threads,
+        deadline=time.monotonic() + args.time_limit if args.time_limit else None,
+        sampler=BucketsSampler(
+            threads=args.threads,
+            sample_size=args.sample_size * 1024,
+            byte_budget=args.sample_budget * 1024 * 1024,
+            keys_per_bucket=args.sample_keys,
+            sample_dir=args.sample_dir,
+        )
+        if args.sample
+        else None,
     )
     logger.info("Generated bucket permutations.")
 
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 from buckets_hunter.utils.dns import DNSUtils
+from buckets_hunter.utils.sampler import BucketsSampler
 
 
 @dataclass
@@ -11,6 +12,8 @@ class Config:
     - output_file: output file - saving scan results
     - buckets_permutations: lists with different buckets to bruteforce
     - directory_wordlist: bucket directory bruteforce
+    - deadline: time.monotonic() timestamp to stop scanning at
+    - sampler: samples files of readable buckets, no sampling if None
     """
 
     dns_utils: DNSUtils = None
@@ -18,3 +21,5 @@ class Config:
     buckets_permutations: List[str] = None
     directory_wordlist: List[str] = None
     threads: Optional[int] = None
+    deadline: Optional[float] = None
+    sampler: Optional[BucketsSampler] = None
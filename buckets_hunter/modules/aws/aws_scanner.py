@@ -1,6 +1,6 @@
 import datetime
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Union
 
 from boto3 import client
@@ -124,7 +124,9 @@ def run(scan_config):
             executor.submit(s3_bucket_scanner.scan_bucket_permissions, bucket_name)
             for bucket_name in scan_config.buckets_permutations
         }
-        for feature in as_completed(found_buckets_futures):
+        for feature in hunter_utils.as_completed_until(
+            found_buckets_futures, scan_config.deadline
+        ):
             try:
                 s3_scan_result = feature.result()
             except Exception as err:
@@ -138,7 +140,9 @@ def run(scan_config):
             executor.submit(s3_bucket_scanner.scan_aws_apps, bucket_name)
             for bucket_name in scan_config.buckets_permutations
         }
-        for feature in as_completed(found_apps_futures):
+        for feature in hunter_utils.as_completed_until(
+            found_apps_futures, scan_config.deadline
+        ):
             try:
                 aws_app_scan_result = feature.result()
             except Exception as err:
@@ -148,4 +152,7 @@ def run(scan_config):
                     print_service(aws_app_scan_result)
                     aws_scan_results.append(aws_app_scan_result)
 
+    if scan_config.sampler:
+        scan_config.sampler.sample_results(aws_scan_results, scan_config.deadline)
+
     return aws_scan_results
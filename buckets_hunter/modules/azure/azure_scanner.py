@@ -1,17 +1,19 @@
 import logging
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Union
 
 import requests
 from loguru import logger
 
 from buckets_hunter.modules.azure.regions import AZURE_REGIONS
-from buckets_hunter.utils.notify import print_service
+from buckets_hunter.utils import hunter_utils
+from buckets_hunter.utils.notify import print_open_bucket, print_service
 
 STORAGE_ACCOUNT_REGEX = re.compile("^[a-z0-9]{3,21}$")
 STORAGE_ACCOUNT_URL = "{}.blob.core.windows.net"
 CONTAINER_URL = "{}.blob.core.windows.net/{}"
+CONTAINER_LIST_QUERY = "restype=container&comp=list"
 WEBAPP_URL = "{}.azurewebsites.net"
 AZURE_VM_URL = "{}.{}.cloudapp.azure.com"
 
@@ -24,17 +26,31 @@ class AzureBucketsScanner:
 
         self.found_storage_accounts = set()
 
-    def bruteforce_container_directory(self, container_directory: str) -> List[str]:
-        found_containers_url = []
+    def bruteforce_container_directory(
+        self, container_directory: str
+    ) -> List[Dict[str, Union[str, Dict[str, bool], List[str]]]]:
+        """Finds public containers, anonymous users can only list a known container."""
+        found_containers = []
         for storage_account in self.found_storage_accounts:
-            # format: storage_account.blob.core.windows.net/container_directory/?restype=container&comp=list
-            container_url = f"https://{CONTAINER_URL.format(storage_account, container_directory)}?restype=container&comp=list"
-            if requests.get(container_url).status_code != 200:
+            container_url = CONTAINER_URL.format(storage_account, container_directory)
+            # format: account.blob.core.windows.net/container?restype=container&comp=list
+            container_list_url = f"https://{container_url}?{CONTAINER_LIST_QUERY}"
+            if requests.get(container_list_url).status_code != 200:
                 continue
 
-            found_containers_url.append(container_url)
+            found_containers.append(
+                {
+                    "platform": AzureBucketsScanner.PLATFORM,
+                    "service": "Azure container",
+                    "bucket": container_url,
+                    "permissions": {"readable": True},
+                    "files": hunter_utils.get_bucket_files(
+                        container_list_url, hunter_utils.BLOB_NAME_REGEX
+                    ),
+                }
+            )
 
-        return found_containers_url
+        return found_containers
 
     def scan_storage_account(self, bucket_name: str) -> Dict[str, str]:
         """Finds Azure storage accounts, only possible to check if user exists by dns lookup."""
@@ -74,10 +90,11 @@ class AzureBucketsScanner:
             
             found_vms.append(azure_vm_url)
 
-        if found_vms is None: return None
+        if not found_vms: return None
         return {
             "platform": AzureBucketsScanner.PLATFORM,
             "service": "Azure VMs",
+            "bucket": bucket_name,
             "vms": found_vms,
         }
 
@@ -92,7 +109,9 @@ def run(scan_config):
             executor.submit(azure_scanner.scan_storage_account, bucket_name)
             for bucket_name in scan_config.buckets_permutations
         }
-        for feature in as_completed(storage_account_features):
+        for feature in hunter_utils.as_completed_until(
+            storage_account_features, scan_config.deadline
+        ):
             try:
                 storage_scan_result = feature.result()
             except Exception as err:
@@ -102,25 +121,34 @@ def run(scan_config):
                     print_service(storage_scan_result)
                     azure_scan_results.append(storage_scan_result)
 
-        # print("Bruteforce Azure containers directories")
-        # if azure_scanner.found_storage_accounts is not None:
-        #     bruteforce_dir_futures = {
-        #         executor.submit(
-        #             azure_scanner.bruteforce_container_directory, container_directory
-        #         )
-        #         for container_directory in scan_config.directory_wordlist
-        #     }
-        #     for feature in as_completed(bruteforce_dir_futures):
-        #         if feature.result():
-        #             print(f"Container directory found: {feature.result()}")
-        # print("\n")
+        if azure_scanner.found_storage_accounts and scan_config.directory_wordlist:
+            logger.info("Bruteforce Azure containers directories")
+            bruteforce_dir_futures = {
+                executor.submit(
+                    azure_scanner.bruteforce_container_directory, container_directory
+                )
+                for container_directory in scan_config.directory_wordlist
+            }
+            for feature in hunter_utils.as_completed_until(
+                bruteforce_dir_futures, scan_config.deadline
+            ):
+                try:
+                    container_scan_results = feature.result()
+                except Exception as err:
+                    logger.error(f"Generated an exception: {err}")
+                else:
+                    for container_scan_result in container_scan_results:
+                        print_open_bucket(container_scan_result)
+                        azure_scan_results.append(container_scan_result)
 
         logger.info("Scanning for Azure Web Apps")
         azure_app_features = {
             executor.submit(azure_scanner.scan_web_apps, bucket_name)
             for bucket_name in scan_config.buckets_permutations
         }
-        for feature in as_completed(azure_app_features):
+        for feature in hunter_utils.as_completed_until(
+            azure_app_features, scan_config.deadline
+        ):
             try:
                 web_scan_result = feature.result()
             except Exception as err:
@@ -137,7 +165,9 @@ def run(scan_config):
             executor.submit(azure_scanner.scan_azure_vm, bucket_name)
             for bucket_name in scan_config.buckets_permutations
         }
-        for feature in as_completed(azure_vms_features):
+        for feature in hunter_utils.as_completed_until(
+            azure_vms_features, scan_config.deadline
+        ):
             try:
                 vms_scan_result = feature.result()
             except Exception as err:
@@ -147,4 +177,7 @@ def run(scan_config):
                     print_service(vms_scan_result)
                     azure_scan_results.append(vms_scan_result)
 
+    if scan_config.sampler:
+        scan_config.sampler.sample_results(azure_scan_results, scan_config.deadline)
+
     return azure_scan_results
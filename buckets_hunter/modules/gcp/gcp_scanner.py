@@ -1,4 +1,4 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Union
 
 import requests
@@ -7,6 +7,8 @@ from loguru import logger
 from buckets_hunter.utils import hunter_utils
 from buckets_hunter.utils.notify import print_service
 
+GCP_STORAGE_URL = "https://storage.googleapis.com/{}"
+
 
 class GCPBucketsScanner:
     PLATFORM = "Gcp"
@@ -37,7 +39,9 @@ class GCPBucketsScanner:
                 "listable": self._check_list_permission(found_permissions),
                 "privesc": self._check_privesc_permission(found_permissions),
             },
-            "files": hunter_utils.get_bucket_files(bucket_url),
+            "files": hunter_utils.get_bucket_files(
+                GCP_STORAGE_URL.format(bucket_name)
+            ),
         }
 
     def _bucket_exists(self, bucket_url):
@@ -72,7 +76,9 @@ def run(scan_config):
             for bucket_name in scan_config.buckets_permutations
         }
 
-        for feature in as_completed(found_buckets_futures):
+        for feature in hunter_utils.as_completed_until(
+            found_buckets_futures, scan_config.deadline
+        ):
             try:
                 gcp_scan_result = feature.result()
             except Exception as err:
@@ -82,4 +88,7 @@ def run(scan_config):
                     print_service(gcp_scan_result)
                     gcp_scan_results.append(gcp_scan_result)
 
+    if scan_config.sampler:
+        scan_config.sampler.sample_results(gcp_scan_results, scan_config.deadline)
+
     return gcp_scan_results
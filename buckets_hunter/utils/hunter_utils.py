@@ -1,44 +1,75 @@
-import os
+import html
 import re
-from typing import Iterator, List
+import time
+from concurrent.futures import Future, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Iterator, List, Optional
+from urllib.parse import quote
 
 import requests
+from loguru import logger
 
-KEY_REGEX = re.compile(r"<(?:Key|Name)>(.*?)</(?:Key|Name)>")
+# S3 and GCS listings, <Name> there is the bucket name itself
+KEY_REGEX = re.compile(r"<Key>(.*?)</Key>")
+# Azure container listings name their blobs with <Name>
+BLOB_NAME_REGEX = re.compile(r"<Name>(.*?)</Name>")
+
+# ordered as generated, {keyword}-{mutation}.s3.amazonaws.com etc.
+BUCKET_PERMUTATION_PATTERNS = (
+    "{keyword}-{mutation}",
+    "{keyword}_{mutation}",
+    "{keyword}{mutation}",
+    # reversed:
+    "{mutation}-{keyword}",
+    "{mutation}_{keyword}",
+    "{mutation}{keyword}",
+)
 
 
 def generate_bucket_permutations(keyword: str, mutations) -> Iterator:
     bucket_names = [keyword]
     for mutation in mutations:
-        # format ex: {keyword}-{mutation}.s3.amazonaws.com
-        bucket_names.append(f"{keyword}-{mutation}")
-
-        # format ex: {keyword}_{mutation}.s3.amazonaws.com
-        bucket_names.append(f"{keyword}_{mutation}")
+        bucket_names.extend(
+            pattern.format(keyword=keyword, mutation=mutation)
+            for pattern in BUCKET_PERMUTATION_PATTERNS
+        )
 
-        # format ex: {keyword}{mutation}.s3.amazonaws.com
-        bucket_names.append(f"{keyword}{mutation}")
+    return iter(bucket_names)
 
-        # reversed:
-        bucket_names.append(f"{mutation}-{keyword}")
-        bucket_names.append(f"{mutation}_{keyword}")
-        bucket_names.append(f"{mutation}{keyword}")
 
-    return iter(bucket_names)
+def as_completed_until(futures, deadline: Optional[float] = None) -> Iterator[Future]:
+    """Yields finished futures, cancels the pending ones once the deadline passes.
+    - deadline: time.monotonic() timestamp, waits for all futures if None
+    """
+    if deadline is None:
+        yield from as_completed(futures)
+        return
 
+    try:
+        for future in as_completed(
+            futures, timeout=max(deadline - time.monotonic(), 0)
+        ):
+            yield future
+    except FuturesTimeoutError:
+        cancelled_futures = sum(future.cancel() for future in futures)
+        logger.warning(
+            f"Scan time limit reached, skipped {cancelled_futures} pending jobs."
+        )
 
 
-def get_bucket_files(bucket_url: str) -> List[str]:
+def get_bucket_files(bucket_url: str, key_regex=KEY_REGEX) -> List[str]:
     """Finds files inside an existing bucket."""
     response = requests.get(bucket_url)
-    bucket_files = re.findall(KEY_REGEX, response.text)
+    bucket_files = re.findall(key_regex, response.text)
     sub_regex = re.compile(r"(\?.*)")
     bucket_url = sub_regex.sub("", bucket_url)
 
+    # keys are xml escaped in the listing and must be url encoded in the file url
     found_bucket_files = []
     if bucket_files is not None:
         found_bucket_files.extend(
-            f"{bucket_url}/{bucket_file}" for bucket_file in bucket_files
+            f"{bucket_url}/{quote(html.unescape(bucket_file), safe='/')}"
+            for bucket_file in bucket_files
         )
 
     return found_bucket_files
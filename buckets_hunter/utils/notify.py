@@ -23,6 +23,22 @@ def prettify_files(urls):
     return "\n\t\t".join(urls)
 
 
+def print_samples(result):
+    matched_samples = [
+        f"{sample['url']}: {', '.join(sample['signatures'])}"
+        for sample in result["samples"]
+        if sample["signatures"]
+    ]
+    if not matched_samples:
+        return
+
+    msg = f"""{Colors.WARNING} Interesting files in {result['platform']} bucket:
+        bucket: {result['bucket']}
+        samples:\t{prettify_files(matched_samples)}
+        """
+    print(msg)
+
+
 def print_service(result):
     msg = f"""{Colors.OKCYAN} {result['platform']} service found:
         service: {result['service']}
@@ -0,0 +1,182 @@
+import heapq
+import re
+from collections import Counter
+from typing import Iterable, List, Optional
+
+import ujson
+from loguru import logger
+
+from buckets_hunter.utils.hunter_utils import BUCKET_PERMUTATION_PATTERNS
+
+# prior likelihood of each naming pattern, dashed names are the most common
+PATTERN_PRIORS = {
+    "{keyword}-{mutation}": 1.0,
+    "{keyword}_{mutation}": 0.5,
+    "{keyword}{mutation}": 0.6,
+    "{mutation}-{keyword}": 0.7,
+    "{mutation}_{keyword}": 0.3,
+    "{mutation}{keyword}": 0.4,
+}
+
+# mutations that usually point to high-value buckets
+MUTATION_PRIORS = {
+    "prod": 5.0,
+    "production": 4.0,
+    "backup": 5.0,
+    "backups": 4.0,
+    "bak": 3.0,
+    "data": 3.0,
+    "db": 3.0,
+    "database": 3.0,
+    "dump": 3.0,
+    "logs": 3.0,
+    "private": 3.0,
+    "internal": 2.5,
+    "staging": 2.5,
+    "stage": 2.0,
+    "dev": 2.5,
+    "test": 2.0,
+    "assets": 2.0,
+    "static": 2.0,
+    "media": 2.0,
+    "uploads": 2.0,
+    "files": 2.0,
+    "public": 2.0,
+    "archive": 2.0,
+}
+
+HISTORY_BOOST = 3.0
+URL_SCHEME_REGEX = re.compile(r"^https?://")
+# bucket name prefixes and suffixes of the scan result bucket urls
+BUCKET_URL_PREFIXES = (
+    "www.googleapis.com/storage/v1/b/",
+    "storage.googleapis.com/",
+)
+BUCKET_HOST_SUFFIXES = (
+    ".s3.amazonaws.com",
+    ".blob.core.windows.net",
+    ".awsapps.com",
+    ".azurewebsites.net",
+)
+
+
+class BucketsPrioritizer:
+    """Scores bucket permutations so the likeliest hits are scanned first.
+    - keyword: keyword used for generating bucket permutations
+    - mutations: wordlist mutations, repeated entries weigh more
+    - history_files: JSON scan results of previous runs
+    """
+
+    def __init__(
+        self,
+        keyword: str,
+        mutations: Iterable[str],
+        history_files: Optional[List[str]] = None,
+    ):
+        self._keyword = keyword
+        self._mutations_frequency = Counter(
+            mutation for mutation in mutations if mutation
+        )
+
+        self._history_mutations = Counter()
+        self._history_patterns = Counter()
+        for history_file in history_files or []:
+            self._load_history(history_file)
+
+    def _load_history(self, history_file: str):
+        """Learns mutations and patterns that hit in a previous scan."""
+        try:
+            with open(history_file, "r", encoding="UTF-8") as json_file:
+                scan_results = ujson.load(json_file)
+        except (OSError, ValueError) as err:
+            logger.error(f"Couldn't load scan history {history_file=}: {err}")
+            return
+
+        if not isinstance(scan_results, list):
+            logger.error(
+                f"Couldn't load scan history {history_file=}: expected a list"
+            )
+            return
+
+        for scan_result in scan_results:
+            if not isinstance(scan_result, dict):
+                logger.error(
+                    f"Skipping scan history entry in {history_file=}: {scan_result!r}"
+                )
+                continue
+
+            bucket_name = self._extract_bucket_name(scan_result.get("bucket", ""))
+            if not bucket_name:
+                continue
+
+            for mutation in self._mutations_frequency:
+                for pattern in BUCKET_PERMUTATION_PATTERNS:
+                    if bucket_name == pattern.format(
+                        keyword=self._keyword, mutation=mutation
+                    ):
+                        self._history_mutations[mutation] += 1
+                        self._history_patterns[pattern] += 1
+
+    @staticmethod
+    def _extract_bucket_name(bucket_url: str) -> Optional[str]:
+        """Extracts the bucket name from a scan result bucket url."""
+        bucket_name = URL_SCHEME_REGEX.sub("", bucket_url)
+        for url_prefix in BUCKET_URL_PREFIXES:
+            if bucket_name.startswith(url_prefix):
+                bucket_name = bucket_name[len(url_prefix) :]
+
+        bucket_name = bucket_name.split("?", 1)[0].split("/", 1)[0]
+        for host_suffix in BUCKET_HOST_SUFFIXES:
+            if bucket_name.endswith(host_suffix):
+                bucket_name = bucket_name[: -len(host_suffix)]
+
+        return bucket_name or None
+
+    def score(self, mutation: str, pattern: str) -> float:
+        mutation_weight = (
+            MUTATION_PRIORS.get(mutation.lower(), 1.0)
+            * self._mutations_frequency[mutation]
+            + HISTORY_BOOST * self._history_mutations[mutation]
+        )
+        pattern_weight = PATTERN_PRIORS.get(pattern, 0.1) * (
+            1 + self._history_patterns[pattern]
+        )
+        return mutation_weight * pattern_weight
+
+    def prioritized_permutations(self, budget: Optional[int] = None) -> List[str]:
+        """Returns bucket permutations ordered by score, up to budget names."""
+        # heap entries: (-score, insertion order, bucket name), ties keep wordlist order
+        permutations_queue = []
+        for mutation in self._mutations_frequency:
+            for pattern in BUCKET_PERMUTATION_PATTERNS:
+                heapq.heappush(
+                    permutations_queue,
+                    (
+                        -self.score(mutation, pattern),
+                        len(permutations_queue),
+                        pattern.format(keyword=self._keyword, mutation=mutation),
+                    ),
+                )
+
+        # the bare keyword is always scanned first
+        bucket_names = [self._keyword]
+        seen_names = {self._keyword}
+        while permutations_queue and (budget is None or len(bucket_names) < budget):
+            _, _, bucket_name = heapq.heappop(permutations_queue)
+            if bucket_name in seen_names:
+                continue
+
+            seen_names.add(bucket_name)
+            bucket_names.append(bucket_name)
+
+        return bucket_names[:budget] if budget is not None else bucket_names
+
+
+def prioritize_bucket_permutations(
+    keyword: str,
+    mutations: Iterable[str],
+    history_files: Optional[List[str]] = None,
+    budget: Optional[int] = None,
+) -> List[str]:
+    prioritizer = BucketsPrioritizer(keyword, mutations, history_files)
+    return prioritizer.prioritized_permutations(budget)
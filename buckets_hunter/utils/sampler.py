@@ -0,0 +1,225 @@
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+from urllib.parse import unquote
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+from buckets_hunter.utils import hunter_utils
+from buckets_hunter.utils.notify import print_samples
+
+CHUNK_SIZE = 8192
+
+# interesting file names, checked against the object key
+FILENAME_SIGNATURES = {
+    "private key": re.compile(
+        r"(id_rsa|id_dsa|id_ecdsa|id_ed25519|\.pem|\.key|\.p12|\.pfx)$", re.I
+    ),
+    "credentials": re.compile(
+        r"(credentials|\.env|\.htpasswd|\.netrc|\.npmrc|\.pgpass)$", re.I
+    ),
+    "database dump": re.compile(
+        r"\.(sql|sqlite3?|db|dump|mdb|bak)(\.gz|\.zip)?$", re.I
+    ),
+    "terraform state": re.compile(r"\.tfstate(\.backup)?$", re.I),
+    "config file": re.compile(r"\.(conf|config|cfg|ini|ya?ml|properties)$", re.I),
+    "backup archive": re.compile(
+        r"(backup|\.tar|\.tgz|\.tar\.gz|\.zip|\.7z|\.rar)$", re.I
+    ),
+    "log file": re.compile(r"\.log$", re.I),
+}
+
+# interesting contents, checked against the sampled bytes
+CONTENT_SIGNATURES = {
+    "aws access key": re.compile(rb"(?:AKIA|ASIA)[0-9A-Z]{16}"),
+    "private key": re.compile(
+        rb"-----BEGIN (?:RSA |DSA |EC |OPENSSH |PGP )?PRIVATE KEY"
+    ),
+    "google api key": re.compile(rb"AIza[0-9A-Za-z\-_]{35}"),
+    "slack token": re.compile(rb"xox[abposr]-[0-9A-Za-z-]{10,}"),
+    "github token": re.compile(rb"gh[pousr]_[0-9A-Za-z]{36}"),
+    "password": re.compile(rb"(?:password|passwd|pwd)\s*[:=]", re.I),
+    "connection string": re.compile(
+        rb"(?:mongodb|mysql|postgres(?:ql)?|redis)://[^\s:]+:[^\s@]+@", re.I
+    ),
+    "sql dump": re.compile(rb"(?:CREATE TABLE|INSERT INTO)", re.I),
+}
+
+
+class BucketsSampler:
+    """Samples the first bytes of objects inside readable buckets.
+    - threads: parallel range requests, also the connection pool size
+    - sample_size: bytes to fetch from each object
+    - byte_budget: total bytes to fetch across all buckets
+    - keys_per_bucket: max objects to sample in each bucket
+    - sample_dir: directory to save samples to, nothing is saved if None
+    """
+
+    def __init__(
+        self,
+        threads: int,
+        sample_size: int,
+        byte_budget: int,
+        keys_per_bucket: int,
+        sample_dir: Optional[str] = None,
+    ):
+        self._threads = threads
+        self._sample_size = sample_size
+        self._keys_per_bucket = keys_per_bucket
+        self._sample_dir = sample_dir
+
+        self._budget_lock = threading.Lock()
+        self._remaining_budget = byte_budget
+
+        if self._sample_dir:
+            os.makedirs(self._sample_dir, exist_ok=True)
+
+        self._session = self._initialize_session()
+
+    def _initialize_session(self) -> requests.Session:
+        session = requests.Session()
+        pooled_adapter = HTTPAdapter(
+            pool_connections=self._threads, pool_maxsize=self._threads
+        )
+        session.mount("https://", pooled_adapter)
+        session.mount("http://", pooled_adapter)
+        return session
+
+    def sample_results(
+        self, scan_results: List[Dict], deadline: Optional[float] = None
+    ) -> List[Dict]:
+        """Adds content samples to the readable buckets of the scan results,
+        a failed sampling never loses the scan results."""
+        try:
+            self._sample_results(scan_results, deadline)
+        except Exception as err:
+            logger.error(f"Sampling failed: {err}")
+        return scan_results
+
+    def _sample_results(self, scan_results: List[Dict], deadline: Optional[float]):
+        sample_jobs = [
+            (scan_result, file_url)
+            for scan_result in scan_results
+            if scan_result.get("permissions", {}).get("readable")
+            for file_url in self.select_files(scan_result.get("files", []))
+        ]
+        if not sample_jobs:
+            return
+
+        logger.info(f"Sampling {len(sample_jobs)} files from readable buckets")
+        with ThreadPoolExecutor(max_workers=self._threads) as executor:
+            sample_futures = {
+                executor.submit(self.sample_file, file_url): scan_result
+                for scan_result, file_url in sample_jobs
+            }
+            for feature in hunter_utils.as_completed_until(sample_futures, deadline):
+                try:
+                    sample = feature.result()
+                except Exception as err:
+                    logger.error(err)
+                else:
+                    if sample:
+                        sample_futures[feature].setdefault("samples", []).append(
+                            sample
+                        )
+
+        for scan_result in scan_results:
+            if "samples" in scan_result:
+                scan_result["samples"].sort(
+                    key=lambda sample: len(sample["signatures"]), reverse=True
+                )
+                print_samples(scan_result)
+
+    def select_files(self, file_urls: List[str]) -> List[str]:
+        """Picks the files to sample, interesting file names first."""
+        file_urls = [
+            file_url for file_url in file_urls if not file_url.endswith("/")
+        ]
+        file_urls.sort(key=lambda file_url: not match_filename(file_url))
+        return file_urls[: self._keys_per_bucket]
+
+    def sample_file(
+        self, file_url: str
+    ) -> Optional[Dict[str, Union[str, int, List[str]]]]:
+        """Fetches the first bytes of a file with a range request."""
+        reserved_bytes = self._reserve_budget()
+        if not reserved_bytes:
+            return None
+
+        sample_data = bytearray()
+        try:
+            with self._session.get(
+                file_url,
+                headers={"Range": f"bytes=0-{reserved_bytes - 1}"},
+                stream=True,
+                timeout=10,
+            ) as response:
+                if response.status_code not in [200, 206]:
+                    return None
+
+                # servers ignoring the range header send the whole file
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    sample_data += chunk[: reserved_bytes - len(sample_data)]
+                    if len(sample_data) >= reserved_bytes:
+                        break
+        except requests.RequestException as err:
+            logger.error(f"Failed sampling {file_url=}: {err}")
+            return None
+        finally:
+            self._release_budget(reserved_bytes - len(sample_data))
+
+        # same signature name may match both the file name and its content
+        signatures = list(
+            dict.fromkeys(match_filename(file_url) + match_content(sample_data))
+        )
+        sample = {
+            "url": file_url,
+            "size": len(sample_data),
+            "signatures": signatures,
+        }
+        if self._sample_dir:
+            try:
+                sample["path"] = self._save_sample(file_url, sample_data)
+            except OSError as err:
+                logger.error(f"Failed saving sample of {file_url=}: {err}")
+        return sample
+
+    def _reserve_budget(self) -> int:
+        with self._budget_lock:
+            reserved_bytes = min(self._sample_size, self._remaining_budget)
+            self._remaining_budget -= reserved_bytes
+        return reserved_bytes
+
+    def _release_budget(self, unused_bytes: int):
+        with self._budget_lock:
+            self._remaining_budget += unused_bytes
+
+    def _save_sample(self, file_url: str, sample_data: bytes) -> str:
+        url_hash = hashlib.sha1(file_url.encode()).hexdigest()[:12]
+        file_name = re.sub(r"[^\w.-]", "_", file_url.rsplit("/", 1)[-1])[-64:]
+        sample_path = os.path.join(self._sample_dir, f"{url_hash}_{file_name}")
+        with open(sample_path, "wb") as sample_file:
+            sample_file.write(sample_data)
+        return sample_path
+
+
+def match_filename(file_url: str) -> List[str]:
+    file_name = unquote(file_url.split("?", 1)[0])
+    return [
+        signature_name
+        for signature_name, signature_regex in FILENAME_SIGNATURES.items()
+        if signature_regex.search(file_name)
+    ]
+
+
+def match_content(sample_data: bytes) -> List[str]:
+    return [
+        signature_name
+        for signature_name, signature_regex in CONTENT_SIGNATURES.items()
+        if signature_regex.search(sample_data)
+    ]